@@ -5,6 +5,7 @@ Supports MySQL and PostgreSQL connections
 
 import os
 import logging
+import functools
 from typing import Optional
 from enum import Enum
 
@@ -35,34 +36,28 @@ class DatabaseConfig:
     POSTGRES_PASSWORD: Optional[str] = os.getenv("DB_POSTGRES_PASSWORD")
     POSTGRES_DATABASE: Optional[str] = os.getenv("DB_POSTGRES_NAME")
     
+    # Environment is read once at import, so the configured flags never change
+    _MYSQL_CONFIGURED: bool = bool(
+        MYSQL_HOST and MYSQL_USER and MYSQL_PASSWORD and MYSQL_DATABASE
+    )
+    _POSTGRES_CONFIGURED: bool = bool(
+        POSTGRES_HOST and POSTGRES_USER and POSTGRES_PASSWORD and POSTGRES_DATABASE
+    )
+    
     @classmethod
     def is_mysql_configured(cls) -> bool:
         """Check if MySQL is configured"""
-        return all([
-            cls.MYSQL_HOST,
-            cls.MYSQL_USER,
-            cls.MYSQL_PASSWORD,
-            cls.MYSQL_DATABASE
-        ])
+        return cls._MYSQL_CONFIGURED
     
     @classmethod
     def is_postgresql_configured(cls) -> bool:
         """Check if PostgreSQL is configured"""
-        return all([
-            cls.POSTGRES_HOST,
-            cls.POSTGRES_USER,
-            cls.POSTGRES_PASSWORD,
-            cls.POSTGRES_DATABASE
-        ])
+        return cls._POSTGRES_CONFIGURED
     
     @classmethod
     def get_active_database_type(cls) -> Optional[DatabaseType]:
         """Get the active database type"""
-        if cls.is_mysql_configured():
-            return DatabaseType.MYSQL
-        elif cls.is_postgresql_configured():
-            return DatabaseType.POSTGRESQL
-        return None
+        return ACTIVE_DATABASE_TYPE
     
     @classmethod
     def log_configuration(cls):
@@ -73,11 +68,20 @@ class DatabaseConfig:
         logger.info(f"MySQL Status: {mysql_status}")
         logger.info(f"PostgreSQL Status: {postgres_status}")
         
-        active = cls.get_active_database_type()
+        active = ACTIVE_DATABASE_TYPE
         logger.info(f"Active Database: {active.value if active else 'NONE'}")
 
 
+# Active database type, resolved once at import
+ACTIVE_DATABASE_TYPE: Optional[DatabaseType] = (
+    DatabaseType.MYSQL if DatabaseConfig._MYSQL_CONFIGURED
+    else DatabaseType.POSTGRESQL if DatabaseConfig._POSTGRES_CONFIGURED
+    else None
+)
+
+
 # MySQL connection string
+@functools.lru_cache(maxsize=1)
 def get_mysql_url() -> Optional[str]:
     """Get MySQL connection URL"""
     if not DatabaseConfig.is_mysql_configured():
@@ -91,6 +95,7 @@ def get_mysql_url() -> Optional[str]:
 
 
 # PostgreSQL connection string
+@functools.lru_cache(maxsize=1)
 def get_postgresql_url() -> Optional[str]:
     """Get PostgreSQL connection URL"""
     if not DatabaseConfig.is_postgresql_configured():
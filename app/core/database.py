@@ -3,12 +3,47 @@ Database Utility Module: Query execution, validation, and table schema reflectio
 Handles parameterized queries to prevent SQL injection.
 """
 
+import asyncio
+import itertools
 import logging
-import aiomysql
-from typing import List, Dict, Any, Optional, Tuple
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union, AsyncIterator, Iterable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    import aiomysql
 
 logger = logging.getLogger(__name__)
 
+# aiomysql is imported on first use to keep it off the import path
+_aiomysql = None
+
+
+def _get_aiomysql():
+    """Import aiomysql lazily and cache the module."""
+    global _aiomysql
+    if _aiomysql is None:
+        import aiomysql
+        _aiomysql = aiomysql
+    return _aiomysql
+
+# Schema metadata cache: (db_name, table_name) -> (fetched_at, columns or None)
+SCHEMA_CACHE_TTL: float = float(os.getenv("SCHEMA_CACHE_TTL", "60"))
+_SCHEMA_CACHE_MAX_ENTRIES = 1024
+_SCHEMA_CACHE: Dict[Tuple[str, str], Tuple[float, Optional[List[str]]]] = {}
+_SCHEMA_LOCKS: Dict[Tuple[str, str], asyncio.Lock] = {}
+# Coroutines holding or waiting on each schema lock; the last one out drops it
+_SCHEMA_LOCK_USERS: Dict[Tuple[str, str], int] = {}
+
+# Max concurrent single-row inserts when replaying a failed bulk chunk
+BULK_REPLAY_CONCURRENCY = 10
+
+# Table and column names must be plain SQL identifiers
+_IDENT_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 
 class DatabaseError(Exception):
     """Base exception for database operations."""
@@ -25,10 +60,192 @@ class InvalidOperationError(DatabaseError):
     pass
 
 
-async def table_exists(pool: aiomysql.Pool, table_name: str, db_name: str) -> bool:
+async def _run(
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
+    query: str,
+    args: Any = None,
+    *,
+    dict_cursor: bool = False,
+    fetch: bool = False,
+    many: bool = False,
+    commit: bool = False
+) -> Tuple[Optional[List[Any]], int]:
+    """
+    Execute one statement on a pooled (or caller-supplied) connection.
+    
+    Acquires/releases the connection and cursor directly instead of
+    through nested async context managers.
+    
+    Args:
+        pool: Database connection pool, or a connection to reuse
+        query: SQL statement
+        args: Statement parameters (a sequence of rows when many=True)
+        dict_cursor: Return rows as dictionaries
+        fetch: Fetch and return the result set
+        many: Execute with executemany()
+        commit: Commit after the statement
+    
+    Returns:
+        Tuple of (fetched rows or None, cursor rowcount)
+    """
+    aiomysql = _get_aiomysql()
+    owned = not isinstance(pool, aiomysql.Connection)
+    conn = await pool.acquire() if owned else pool
+    if not owned and conn.closed:
+        # A timed-out attempt on a request-scoped connection closes it;
+        # reconnect so the retry does not fail on a dead socket.
+        await conn.ping()
+    try:
+        cursor = await conn.cursor(aiomysql.DictCursor if dict_cursor else aiomysql.Cursor)
+        try:
+            if many:
+                await cursor.executemany(query, args)
+            else:
+                await cursor.execute(query, args)
+            rows = await cursor.fetchall() if fetch else None
+            if commit:
+                await conn.commit()
+            return rows, cursor.rowcount
+        finally:
+            await cursor.close()
+    finally:
+        if owned:
+            await pool.release(conn)
+
+
+def invalidate_schema_cache(table_name: Optional[str] = None) -> None:
+    """
+    Drop cached schema metadata after DDL changes.
+    
+    Args:
+        table_name: Table to invalidate; clears the whole cache when omitted
+    """
+    if table_name is None:
+        _SCHEMA_CACHE.clear()
+        return
+    for key in [key for key in _SCHEMA_CACHE if key[1] == table_name]:
+        del _SCHEMA_CACHE[key]
+
+
+def _cached_columns(key: Tuple[str, str]) -> Tuple[bool, Optional[List[str]]]:
+    """Return (hit, columns) for a schema cache entry that is still fresh."""
+    entry = _SCHEMA_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < SCHEMA_CACHE_TTL:
+        return True, entry[1]
+    return False, None
+
+
+async def get_table_columns_or_none(
+    pool: "aiomysql.Pool",
+    table_name: str,
+    db_name: str
+) -> Optional[List[str]]:
+    """
+    Get a table's column names, served from a TTL cache when fresh.
+    
+    Concurrent misses for the same table share a single refresh.
+    
+    Args:
+        pool: Database connection pool
+        table_name: Name of the table
+        db_name: Name of the database
+    
+    Returns:
+        List of column names, or None if the table does not exist
+    """
+    key = (db_name, table_name)
+    hit, columns = _cached_columns(key)
+    if hit:
+        return columns
+    
+    lock = _SCHEMA_LOCKS.setdefault(key, asyncio.Lock())
+    _SCHEMA_LOCK_USERS[key] = _SCHEMA_LOCK_USERS.get(key, 0) + 1
+    try:
+        async with lock:
+            hit, columns = _cached_columns(key)
+            if hit:
+                return columns
+            
+            columns = await _fetch_table_columns(pool, table_name, db_name)
+            if len(_SCHEMA_CACHE) >= _SCHEMA_CACHE_MAX_ENTRIES:
+                _SCHEMA_CACHE.clear()
+            _SCHEMA_CACHE[key] = (time.monotonic(), columns)
+            return columns
+    finally:
+        # Only the last coroutine out drops the lock; a queued waiter keeps
+        # it alive so a newcomer can't start a second refresh alongside it
+        users = _SCHEMA_LOCK_USERS[key] - 1
+        if users:
+            _SCHEMA_LOCK_USERS[key] = users
+        else:
+            del _SCHEMA_LOCK_USERS[key]
+            del _SCHEMA_LOCKS[key]
+
+
+async def fetch_table_names(
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
+    db_name: str
+) -> frozenset:
+    """
+    Fetch the names of all tables in a database in one round-trip.
+    
+    Args:
+        pool: Database connection pool
+        db_name: Name of the database
+    
+    Returns:
+        Frozenset of table names
+    """
+    query = "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = %s"
+    
+    try:
+        results, _ = await _run(pool, query, (db_name,), fetch=True)
+        return frozenset(row[0] for row in results)
+    except Exception as e:
+        logger.error("Error fetching table names: %s", e)
+        raise DatabaseError(f"Failed to fetch table names: {str(e)}") from e
+
+
+async def _fetch_table_columns(
+    pool: "aiomysql.Pool",
+    table_name: str,
+    db_name: str
+) -> Optional[List[str]]:
+    """
+    Fetch a table's column names in a single INFORMATION_SCHEMA round-trip.
+    
+    Args:
+        pool: Database connection pool
+        table_name: Name of the table
+        db_name: Name of the database
+    
+    Returns:
+        List of column names, or None if the table does not exist
+    """
+    query = """
+        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """
+    
+    try:
+        results, _ = await _run(pool, query, (db_name, table_name), fetch=True)
+        columns = [row[0] for row in results]
+        logger.debug("Columns for '%s': %s", table_name, columns)
+        return columns or None
+    except Exception as e:
+        logger.error("Error fetching table columns: %s", e)
+        raise DatabaseError(f"Failed to fetch table columns: {str(e)}") from e
+
+
+async def table_exists(pool: "aiomysql.Pool", table_name: str, db_name: str) -> bool:
     """
     Check if a table exists in the information schema.
     
+    Answered from the cached column lookup: a table exists when it has
+    at least one column, so no COUNT(*) over INFORMATION_SCHEMA.TABLES
+    is issued.
+    
     Args:
         pool: Database connection pool
         table_name: Name of the table to check
@@ -41,24 +258,12 @@ async def table_exists(pool: aiomysql.Pool, table_name: str, db_name: str) -> bo
         logger.warning("Database pool is None. Cannot check table existence.")
         return False
     
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                query = """
-                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                """
-                await cursor.execute(query, (db_name, table_name))
-                result = await cursor.fetchone()
-                exists = result[0] > 0
-                logger.debug(f"Table '{table_name}' existence check: {exists}")
-                return exists
-    except Exception as e:
-        logger.error(f"Error checking table existence: {e}")
-        raise DatabaseError(f"Failed to check table existence: {str(e)}")
+    exists = await get_table_columns_or_none(pool, table_name, db_name) is not None
+    logger.debug("Table '%s' existence check: %s", table_name, exists)
+    return exists
 
 
-async def get_table_columns(pool: aiomysql.Pool, table_name: str, db_name: str) -> List[str]:
+async def get_table_columns(pool: "aiomysql.Pool", table_name: str, db_name: str) -> List[str]:
     """
     Get all column names from a table.
     
@@ -74,25 +279,41 @@ async def get_table_columns(pool: aiomysql.Pool, table_name: str, db_name: str)
         logger.warning("Database pool is None. Cannot fetch table columns.")
         return []
     
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                query = """
-                    SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                    ORDER BY ORDINAL_POSITION
-                """
-                await cursor.execute(query, (db_name, table_name))
-                results = await cursor.fetchall()
-                columns = [row[0] for row in results]
-                logger.debug(f"Columns for '{table_name}': {columns}")
-                return columns
-    except Exception as e:
-        logger.error(f"Error fetching table columns: {e}")
-        raise DatabaseError(f"Failed to fetch table columns: {str(e)}")
+    return await get_table_columns_or_none(pool, table_name, db_name) or []
+
+
+@lru_cache(maxsize=4096)
+def _qid(name: str) -> str:
+    """
+    Validate and backtick-quote a table or column identifier (cached).
+    
+    Raises:
+        InvalidOperationError: If the name is not a plain SQL identifier
+    """
+    if not _IDENT_RE.match(name):
+        raise InvalidOperationError(f"Invalid identifier: '{name}'")
+    return "`" + name.replace("`", "``") + "`"
+
+
+@lru_cache(maxsize=1024)
+def _compile_where(columns: Tuple[str, ...], null_mask: Tuple[bool, ...]) -> str:
+    """Compile the WHERE fragment for a column/NULL shape (cached)."""
+    conditions = []
+    for column, is_null in zip(columns, null_mask):
+        if is_null:
+            conditions.append(_qid(column) + " IS NULL")
+        else:
+            conditions.append(_qid(column) + " = %s")
+    return " AND ".join(conditions)
 
 
-def build_where_clause(where_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
+@lru_cache(maxsize=1024)
+def _compile_set(columns: Tuple[str, ...]) -> str:
+    """Compile the SET fragment for a column shape (cached)."""
+    return ", ".join([_qid(column) + " = %s" for column in columns])
+
+
+def build_where_clause(where_dict: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
     """
     Build a WHERE clause from a dictionary of conditions.
     
@@ -100,27 +321,20 @@ def build_where_clause(where_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
         where_dict: Dictionary with column names as keys and filter values
     
     Returns:
-        Tuple of (WHERE clause string, list of values for parameterized query)
+        Tuple of (WHERE clause string, tuple of values for parameterized query)
     """
     if not where_dict:
-        return "", []
-    
-    conditions = []
-    values = []
+        return "", ()
     
-    for column, value in where_dict.items():
-        if value is None:
-            conditions.append(f"`{column}` IS NULL")
-        else:
-            conditions.append(f"`{column}` = %s")
-            values.append(value)
+    null_mask = tuple([value is None for value in where_dict.values()])
+    values = tuple([value for value in where_dict.values() if value is not None])
     
-    where_clause = " AND ".join(conditions)
-    logger.debug(f"WHERE clause: {where_clause}")
+    where_clause = _compile_where(tuple(where_dict), null_mask)
+    logger.debug("WHERE clause: %s", where_clause)
     return where_clause, values
 
 
-def build_set_clause(data_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
+def build_set_clause(data_dict: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
     """
     Build a SET clause for UPDATE statements.
     
@@ -128,35 +342,85 @@ def build_set_clause(data_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
         data_dict: Dictionary with column names and new values
     
     Returns:
-        Tuple of (SET clause string, list of values for parameterized query)
+        Tuple of (SET clause string, tuple of values for parameterized query)
     """
     if not data_dict:
         raise InvalidOperationError("UPDATE requires at least one column to update")
     
-    conditions = []
-    values = []
+    set_clause = _compile_set(tuple(data_dict.keys()))
+    values = tuple(data_dict.values())
+    logger.debug("SET clause: %s", set_clause)
+    return set_clause, values
+
+
+@lru_cache(maxsize=512)
+def _insert_template(table_name: str, columns: Tuple[str, ...]) -> str:
+    """Build the INSERT statement for a table/column shape (cached)."""
+    column_list = ", ".join([_qid(col) for col in columns])
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {_qid(table_name)} ({column_list}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=512)
+def _select_template(table_name: str, where_clause: str) -> str:
+    """Build the SELECT statement for a table/WHERE shape (cached)."""
+    if where_clause:
+        return f"SELECT * FROM {_qid(table_name)} WHERE {where_clause}"
+    return f"SELECT * FROM {_qid(table_name)}"
+
+
+@lru_cache(maxsize=512)
+def _update_template(table_name: str, set_clause: str, where_clause: str) -> str:
+    """Build the UPDATE statement for a table/SET/WHERE shape (cached)."""
+    return f"UPDATE {_qid(table_name)} SET {set_clause} WHERE {where_clause}"
+
+
+@lru_cache(maxsize=512)
+def _delete_template(table_name: str, where_clause: str) -> str:
+    """Build the DELETE statement for a table/WHERE shape (cached)."""
+    return f"DELETE FROM {_qid(table_name)} WHERE {where_clause}"
+
+
+@asynccontextmanager
+async def transaction(pool: "aiomysql.Pool") -> AsyncIterator["aiomysql.Connection"]:
+    """
+    Run several statements in one transaction on a single connection.
     
-    for column, value in data_dict.items():
-        conditions.append(f"`{column}` = %s")
-        values.append(value)
+    Pass the yielded connection to the execute_* helpers with
+    commit=False; the transaction commits once on exit, or rolls back if
+    the block raises.
     
-    set_clause = ", ".join(conditions)
-    logger.debug(f"SET clause: {set_clause}")
-    return set_clause, values
+    Args:
+        pool: Database connection pool
+    
+    Yields:
+        Connection with an open transaction
+    """
+    async with pool.acquire() as conn:
+        await conn.begin()
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
+        await conn.commit()
 
 
 async def execute_insert(
-    pool: aiomysql.Pool,
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
     table_name: str,
-    data: Dict[str, Any]
+    data: Dict[str, Any],
+    *,
+    commit: bool = True
 ) -> int:
     """
     Execute an INSERT statement with parameterized query.
     
     Args:
-        pool: Database connection pool
+        pool: Database connection pool, or a connection to reuse
         table_name: Name of the table
         data: Dictionary with column names and values
+        commit: Commit after the statement; pass False inside transaction()
     
     Returns:
         Number of rows affected
@@ -164,35 +428,208 @@ async def execute_insert(
     if not data:
         raise InvalidOperationError("INSERT requires at least one column and value")
     
-    columns = ", ".join([f"`{col}`" for col in data.keys()])
-    placeholders = ", ".join(["%s"] * len(data))
-    values = list(data.values())
+    query = _insert_template(table_name, tuple(data.keys()))
+    values = tuple(data.values())
+    
+    try:
+        _, rows_affected = await _run(pool, query, values, commit=commit)
+        logger.info("Inserted %s rows into '%s'", rows_affected, table_name)
+        return rows_affected
+    except Exception as e:
+        logger.error("Error inserting into '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to insert data: {str(e)}") from e
+
+
+async def execute_insert_many(
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
+    table_name: str,
+    columns: Tuple[str, ...],
+    rows: List[Sequence[Any]],
+    *,
+    commit: bool = True
+) -> int:
+    """
+    Insert many rows sharing one column shape with a single statement.
+    
+    Uses cursor.executemany(), which folds the rows into one multi-row
+    INSERT ... VALUES packet instead of one round-trip per row.
+    
+    Args:
+        pool: Database connection pool, or a connection to reuse
+        table_name: Name of the table
+        columns: Column names, in the order of each row's values
+        rows: Row value sequences
+        commit: Commit after the statement; pass False inside transaction()
+    
+    Returns:
+        Number of rows affected
+    """
+    if not columns:
+        raise InvalidOperationError("INSERT requires at least one column and value")
+    if not rows:
+        return 0
+    
+    query = _insert_template(table_name, tuple(columns))
+    
+    try:
+        _, rows_affected = await _run(pool, query, rows, many=True, commit=commit)
+        logger.info("Inserted %s rows into '%s'", rows_affected, table_name)
+        return rows_affected
+    except Exception as e:
+        logger.error("Error inserting into '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to insert data: {str(e)}") from e
+
+
+async def _replay_rows(
+    pool: "aiomysql.Pool",
+    conn: "aiomysql.Connection",
+    table_name: str,
+    columns: Tuple[str, ...],
+    chunk: List[Sequence[Any]],
+    start: int
+) -> Tuple[int, List[str]]:
+    """
+    Insert a failed chunk's rows one by one, overlapping round trips.
     
-    query = f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders})"
+    Rows run concurrently on up to BULK_REPLAY_CONCURRENCY extra pooled
+    connections; the bulk loop's own connection is kept in reserve, so a
+    pool with a single connection falls back to replaying on it serially.
     
+    Returns:
+        Tuple of (rows inserted, error messages in record order)
+    """
+    limit = min(BULK_REPLAY_CONCURRENCY, getattr(pool, "maxsize", 1) - 1)
+    target = pool if limit >= 1 else conn
+    semaphore = asyncio.Semaphore(max(limit, 1))
+    
+    async def insert_one(index: int, row: Sequence[Any]) -> Tuple[int, Optional[str]]:
+        if len(row) != len(columns):
+            return 0, f"Record {index}: expected {len(columns)} fields, got {len(row)}"
+        async with semaphore:
+            try:
+                return await execute_insert_many(target, table_name, columns, [row]), None
+            except Exception as e:
+                return 0, f"Record {index}: {str(e)}"
+    
+    results = await asyncio.gather(
+        *(insert_one(index, row) for index, row in enumerate(chunk, start))
+    )
+    return (
+        sum(count for count, _ in results),
+        [error for _, error in results if error is not None]
+    )
+
+
+def _next_chunk(
+    iterator: Iterator[Sequence[Any]],
+    size: int
+) -> Tuple[List[Sequence[Any]], Optional[Exception]]:
+    """Pull up to `size` rows; a read error ends the chunk early and is returned."""
+    chunk: List[Sequence[Any]] = []
     try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute(query, values)
-                await conn.commit()
-                rows_affected = cursor.rowcount
-                logger.info(f"Inserted {rows_affected} rows into '{table_name}'")
-                return rows_affected
+        chunk.extend(itertools.islice(iterator, size))
     except Exception as e:
-        logger.error(f"Error inserting into '{table_name}': {e}")
-        raise DatabaseError(f"Failed to insert data: {str(e)}")
+        return chunk, e
+    return chunk, None
+
+
+async def execute_bulk_insert(
+    pool: "aiomysql.Pool",
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk_size: int = 500
+) -> Dict[str, Any]:
+    """
+    Insert positional rows in multi-row chunks on a single connection.
+    
+    Each chunk is one multi-row INSERT committed in its own transaction.
+    A chunk that fails is rolled back and replayed row by row, so the
+    offending records can be reported while the rest are still inserted.
+    Rows whose length differs from `columns` fail as individual records.
+    
+    `rows` may be a lazy reader over an upload: each chunk is pulled in a
+    worker thread so blocking file reads stay off the event loop. If
+    reading fails (e.g. a decode error), the rows read so far are still
+    inserted, the import stops there and the error is reported in the
+    returned stats, since earlier chunks are already committed.
+    
+    Args:
+        pool: Database connection pool
+        table_name: Name of the table
+        columns: Column names, in the order of each row's values
+        rows: Row value sequences, bound to the statement as-is
+        chunk_size: Number of records per INSERT statement
+    
+    Returns:
+        Dictionary with total, inserted and failed counts and error messages
+    """
+    total = 0
+    inserted = 0
+    failed = 0
+    errors: List[str] = []
+    columns = tuple(columns)
+    iterator = iter(rows)
+    
+    async with pool.acquire() as conn:
+        while True:
+            chunk, read_error = await asyncio.to_thread(_next_chunk, iterator, chunk_size)
+            if chunk:
+                start = total + 1
+                total += len(chunk)
+                
+                try:
+                    if any(len(row) != len(columns) for row in chunk):
+                        raise InvalidOperationError("field count does not match the columns")
+                    await conn.begin()
+                    inserted += await execute_insert_many(
+                        conn, table_name, columns, chunk, commit=False
+                    )
+                    await conn.commit()
+                except Exception as e:
+                    await conn.rollback()
+                    logger.warning(
+                        "Records %s-%s: bulk insert failed (%s), retrying row by row",
+                        start, total, e
+                    )
+                    chunk_inserted, chunk_errors = await _replay_rows(
+                        pool, conn, table_name, columns, chunk, start
+                    )
+                    inserted += chunk_inserted
+                    failed += len(chunk_errors)
+                    errors.extend(chunk_errors)
+            
+            if read_error is not None:
+                total += 1
+                failed += 1
+                errors.append(
+                    f"Record {total}: could not be read, import stopped ({read_error})"
+                )
+                break
+            if len(chunk) < chunk_size:
+                break
+    
+    return {
+        "total_records": total,
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors
+    }
 
 
 async def execute_select(
-    pool: aiomysql.Pool,
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
     table_name: str,
     where_dict: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
     Execute a SELECT statement with optional WHERE conditions.
     
+    The full result set is buffered in memory; use execute_select_stream
+    for large tables.
+    
     Args:
-        pool: Database connection pool
+        pool: Database connection pool, or a connection to reuse
         table_name: Name of the table
         where_dict: Optional dictionary with WHERE conditions
     
@@ -201,37 +638,116 @@ async def execute_select(
     """
     where_clause, where_values = build_where_clause(where_dict or {})
     
-    if where_clause:
-        query = f"SELECT * FROM `{table_name}` WHERE {where_clause}"
-    else:
-        query = f"SELECT * FROM `{table_name}`"
+    query = _select_template(table_name, where_clause)
     
     try:
-        async with pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
+        rows, _ = await _run(pool, query, where_values, dict_cursor=True, fetch=True)
+        logger.info("Selected %s rows from '%s'", len(rows), table_name)
+        return rows
+    except Exception as e:
+        logger.error("Error selecting from '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to select data: {str(e)}") from e
+
+
+async def execute_select_chunks(
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
+    table_name: str,
+    where_dict: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 1000,
+    *,
+    dict_rows: bool = True,
+    with_header: bool = False
+) -> AsyncIterator[List[Any]]:
+    """
+    Stream a SELECT through a server-side (unbuffered) cursor, chunk by chunk.
+    
+    Each fetchmany() result is yielded as-is, so memory use stays bounded
+    regardless of the table size and callers can encode a whole chunk at once.
+    
+    Args:
+        pool: Database connection pool, or a connection to reuse
+        table_name: Name of the table
+        where_dict: Optional dictionary with WHERE conditions
+        chunk_size: Number of rows fetched per round-trip
+        dict_rows: Yield rows as dictionaries; tuples in column order otherwise
+        with_header: First yield the result's column names, taken from the
+            cursor description so they always match the rows' positions
+    
+    Yields:
+        Lists of up to chunk_size rows, after the column names if requested
+    """
+    where_clause, where_values = build_where_clause(where_dict or {})
+    
+    query = _select_template(table_name, where_clause)
+    aiomysql = _get_aiomysql()
+    
+    try:
+        owned = not isinstance(pool, aiomysql.Connection)
+        conn = await pool.acquire() if owned else pool
+        try:
+            cursor = await conn.cursor(aiomysql.SSDictCursor if dict_rows else aiomysql.SSCursor)
+            try:
                 await cursor.execute(query, where_values)
-                rows = await cursor.fetchall()
-                logger.info(f"Selected {len(rows)} rows from '{table_name}'")
-                return rows
+                if with_header:
+                    yield [column[0] for column in cursor.description]
+                total = 0
+                while True:
+                    rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows
+                logger.info("Streamed %s rows from '%s'", total, table_name)
+            finally:
+                await cursor.close()
+        finally:
+            if owned:
+                await pool.release(conn)
     except Exception as e:
-        logger.error(f"Error selecting from '{table_name}': {e}")
-        raise DatabaseError(f"Failed to select data: {str(e)}")
+        logger.error("Error streaming from '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to select data: {str(e)}") from e
+
+
+async def execute_select_stream(
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
+    table_name: str,
+    where_dict: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream rows of a SELECT one at a time through a server-side cursor.
+    
+    Args:
+        pool: Database connection pool, or a connection to reuse
+        table_name: Name of the table
+        where_dict: Optional dictionary with WHERE conditions
+        chunk_size: Number of rows fetched per round-trip
+    
+    Yields:
+        Dictionaries representing rows
+    """
+    async for rows in execute_select_chunks(pool, table_name, where_dict, chunk_size):
+        for row in rows:
+            yield row
 
 
 async def execute_update(
-    pool: aiomysql.Pool,
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
     table_name: str,
     data: Dict[str, Any],
-    where_dict: Dict[str, Any]
+    where_dict: Dict[str, Any],
+    *,
+    commit: bool = True
 ) -> int:
     """
     Execute an UPDATE statement with parameterized query.
     
     Args:
-        pool: Database connection pool
+        pool: Database connection pool, or a connection to reuse
         table_name: Name of the table
         data: Dictionary with new column values
         where_dict: Dictionary with WHERE conditions
+        commit: Commit after the statement; pass False inside transaction()
     
     Returns:
         Number of rows affected
@@ -242,34 +758,33 @@ async def execute_update(
     if not where_clause:
         raise InvalidOperationError("UPDATE requires WHERE conditions for safety")
     
-    query = f"UPDATE `{table_name}` SET {set_clause} WHERE {where_clause}"
-    all_values = set_values + where_values
-    
+    query = _update_template(table_name, set_clause, where_clause)
     try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute(query, all_values)
-                await conn.commit()
-                rows_affected = cursor.rowcount
-                logger.info(f"Updated {rows_affected} rows in '{table_name}'")
-                return rows_affected
+        _, rows_affected = await _run(
+            pool, query, (*set_values, *where_values), commit=commit
+        )
+        logger.info("Updated %s rows in '%s'", rows_affected, table_name)
+        return rows_affected
     except Exception as e:
-        logger.error(f"Error updating '{table_name}': {e}")
-        raise DatabaseError(f"Failed to update data: {str(e)}")
+        logger.error("Error updating '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to update data: {str(e)}") from e
 
 
 async def execute_delete(
-    pool: aiomysql.Pool,
+    pool: Union["aiomysql.Pool", "aiomysql.Connection"],
     table_name: str,
-    where_dict: Dict[str, Any]
+    where_dict: Dict[str, Any],
+    *,
+    commit: bool = True
 ) -> int:
     """
     Execute a DELETE statement with parameterized query.
     
     Args:
-        pool: Database connection pool
+        pool: Database connection pool, or a connection to reuse
         table_name: Name of the table
         where_dict: Dictionary with WHERE conditions
+        commit: Commit after the statement; pass False inside transaction()
     
     Returns:
         Number of rows affected
@@ -279,16 +794,12 @@ async def execute_delete(
     if not where_clause:
         raise InvalidOperationError("DELETE requires WHERE conditions for safety")
     
-    query = f"DELETE FROM `{table_name}` WHERE {where_clause}"
+    query = _delete_template(table_name, where_clause)
     
     try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute(query, where_values)
-                await conn.commit()
-                rows_affected = cursor.rowcount
-                logger.info(f"Deleted {rows_affected} rows from '{table_name}'")
-                return rows_affected
+        _, rows_affected = await _run(pool, query, where_values, commit=commit)
+        logger.info("Deleted %s rows from '%s'", rows_affected, table_name)
+        return rows_affected
     except Exception as e:
-        logger.error(f"Error deleting from '{table_name}': {e}")
-        raise DatabaseError(f"Failed to delete data: {str(e)}")
+        logger.error("Error deleting from '%s': %s", table_name, e)
+        raise DatabaseError(f"Failed to delete data: {str(e)}") from e
@@ -4,43 +4,129 @@ Handles timeouts, retries, and standardized error responses.
 """
 
 import asyncio
+import functools
 import logging
-from typing import Callable, Any, TypeVar, Awaitable
-from datetime import datetime
+import sys
+import time
+from typing import Callable, Any, Optional, TypeVar, Awaitable
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# asyncio.timeout (3.11+) runs in the caller's task; wait_for wraps a new Task
+_asyncio_timeout = asyncio.timeout if sys.version_info >= (3, 11) else None
+
 # Backoff schedule: (retry_count, delay_in_seconds, timeout_limit_in_seconds)
-BACKOFF_SCHEDULE = [
+_SCHEDULE = (
     (0, 0.0, 0.2),      # Initial attempt: 200ms timeout, no delay
     (1, 0.4, 0.4),      # Retry 1: 400ms delay, 400ms timeout
     (2, 0.8, 0.8),      # Retry 2: 800ms delay, 800ms timeout
     (3, 1.6, 1.6),      # Retry 3: 1600ms delay, 1600ms timeout
-]
+)
+
+# Precomputed (retry_count, delay, timeout_limit, retries_remaining)
+BACKOFF_SCHEDULE = tuple(
+    (retry_count, delay, timeout_limit, len(_SCHEDULE) - retry_count - 1)
+    for retry_count, delay, timeout_limit in _SCHEDULE
+)
+_TOTAL_ATTEMPTS = len(BACKOFF_SCHEDULE)
+_RETRY_SCHEDULE = BACKOFF_SCHEDULE[1:]
+
+# Circuit breaker: consecutive exhausted-retry failures before opening,
+# and seconds to stay open before letting a probe call through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 5.0
+
+# MySQL server errors worth retrying: too many connections, lock wait
+# timeout, deadlock. Client-side errors (2000+) are all connection-level.
+_TRANSIENT_MYSQL_ERRNOS = frozenset({1040, 1205, 1213})
+_MYSQL_CLIENT_ERRNO_MIN = 2000
+
+
+# Error codes shared by every exception instance
+_CODE_500 = sys.intern("500")
+_CODE_503 = sys.intern("503")
+_CODE_504 = sys.intern("504")
 
 
 class ResiliencyException(Exception):
     """Base exception for resiliency-related errors."""
-    def __init__(self, message: str, retry_count: int = 0, error_code: str = "500"):
+    def __init__(self, message: str, retry_count: int = 0, error_code: str = _CODE_500):
         self.message = message
         self.retry_count = retry_count
         self.error_code = error_code
-        self.timestamp = datetime.utcnow().isoformat() + "Z"
+        self.created_at = time.time()
         super().__init__(self.message)
+    
+    @functools.cached_property
+    def timestamp(self) -> str:
+        """ISO-8601 UTC creation timestamp, formatted on first access."""
+        created = datetime.fromtimestamp(self.created_at, timezone.utc)
+        return created.isoformat().replace("+00:00", "Z")
 
 
 class GatewayTimeoutException(ResiliencyException):
     """Raised when all retries are exhausted (504)."""
     def __init__(self, message: str, retry_count: int):
-        super().__init__(message, retry_count, "504")
+        super().__init__(message, retry_count, _CODE_504)
 
 
 class ServiceUnavailableException(ResiliencyException):
     """Raised when database is unavailable (503)."""
     def __init__(self, message: str, retry_count: int = 0):
-        super().__init__(message, retry_count, "503")
+        super().__init__(message, retry_count, _CODE_503)
+
+
+def _is_transient_mysql_error(error: BaseException) -> bool:
+    """True for pymysql connection-level errors; False if pymysql is absent."""
+    try:
+        from pymysql.err import InterfaceError, OperationalError
+    except ImportError:  # pragma: no cover - aiomysql depends on pymysql
+        return False
+    if isinstance(error, InterfaceError):
+        return True
+    if isinstance(error, OperationalError) and error.args and isinstance(error.args[0], int):
+        errno = error.args[0]
+        return errno in _TRANSIENT_MYSQL_ERRNOS or errno >= _MYSQL_CLIENT_ERRNO_MIN
+    return False
+
+
+def is_transient_error(error: Optional[BaseException]) -> bool:
+    """
+    Whether an error is worth retrying (and counts against the breaker).
+    
+    Timeouts, socket errors and MySQL connection/lock errors are transient;
+    validation errors, SQL/integrity errors and anything else are not.
+    Wrapped errors (raise ... from e) are judged by their cause.
+    """
+    while error is not None:
+        if isinstance(error, (asyncio.TimeoutError, OSError)):
+            return True
+        if _is_transient_mysql_error(error):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _log_attempt_failure(
+    retry_count: int,
+    timeout_limit: float,
+    remaining: int,
+    error: Exception
+) -> None:
+    """Log a failed attempt, distinguishing timeouts from other errors."""
+    if isinstance(error, asyncio.TimeoutError):
+        logger.warning(
+            "Attempt %s: Timeout (limit: %ss). Retries remaining: %s",
+            retry_count, timeout_limit, remaining
+        )
+    else:
+        logger.warning(
+            "Attempt %s: Exception - %s. Retries remaining: %s",
+            retry_count, error, remaining
+        )
 
 
 async def execute_with_retries(
@@ -59,50 +145,63 @@ async def execute_with_retries(
     Returns:
         Result of the function execution
     
+    Only transient errors (see is_transient_error) are retried; any other
+    exception is re-raised immediately from the attempt that raised it.
+    
     Raises:
         GatewayTimeoutException: If all retries fail due to timeout
         ServiceUnavailableException: If database is unavailable
     """
-    last_exception = None
+    # Fast path: the first attempt has no delay and usually succeeds
+    _, _, first_timeout, first_remaining = BACKOFF_SCHEDULE[0]
+    try:
+        if _asyncio_timeout is not None:
+            async with _asyncio_timeout(first_timeout):
+                return await coro_func(*args, **kwargs)
+        return await asyncio.wait_for(coro_func(*args, **kwargs), timeout=first_timeout)
+    except Exception as e:
+        if not is_transient_error(e):
+            raise
+        last_exception = e
+        _log_attempt_failure(0, first_timeout, first_remaining, e)
     
-    for retry_count, delay, timeout_limit in BACKOFF_SCHEDULE:
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    for retry_count, delay, timeout_limit, remaining in _RETRY_SCHEDULE:
         try:
-            # Apply delay before retry (not on initial attempt)
-            if delay > 0:
-                logger.debug(f"Retry {retry_count}: Waiting {delay}s before attempt")
-                await asyncio.sleep(delay)
+            # Apply delay before retry
+            if debug:
+                logger.debug("Retry %s: Waiting %ss before attempt", retry_count, delay)
+            await asyncio.sleep(delay)
             
             # Execute with timeout
-            logger.debug(f"Attempt {retry_count}: Executing with {timeout_limit}s timeout")
-            result = await asyncio.wait_for(
-                coro_func(*args, **kwargs),
-                timeout=timeout_limit
-            )
-            logger.debug(f"Attempt {retry_count}: Success")
+            if debug:
+                logger.debug("Attempt %s: Executing with %ss timeout", retry_count, timeout_limit)
+            if _asyncio_timeout is not None:
+                async with _asyncio_timeout(timeout_limit):
+                    result = await coro_func(*args, **kwargs)
+            else:
+                result = await asyncio.wait_for(
+                    coro_func(*args, **kwargs),
+                    timeout=timeout_limit
+                )
+            if debug:
+                logger.debug("Attempt %s: Success", retry_count)
             return result
         
-        except asyncio.TimeoutError as e:
-            last_exception = e
-            logger.warning(
-                f"Attempt {retry_count}: Timeout (limit: {timeout_limit}s). "
-                f"Retries remaining: {len(BACKOFF_SCHEDULE) - retry_count - 1}"
-            )
-        
         except Exception as e:
+            if not is_transient_error(e):
+                raise
             last_exception = e
-            logger.warning(
-                f"Attempt {retry_count}: Exception - {str(e)}. "
-                f"Retries remaining: {len(BACKOFF_SCHEDULE) - retry_count - 1}"
-            )
+            _log_attempt_failure(retry_count, timeout_limit, remaining, e)
     
     # All retries exhausted
-    retry_count = len(BACKOFF_SCHEDULE) - 1
-    logger.error(f"All retries exhausted after {retry_count + 1} attempts")
+    logger.error("All retries exhausted after %s attempts", _TOTAL_ATTEMPTS)
     
     raise GatewayTimeoutException(
-        f"Database operation timed out after {retry_count + 1} attempts. "
+        f"Database operation timed out after {_TOTAL_ATTEMPTS} attempts. "
         f"Last error: {str(last_exception)}",
-        retry_count=retry_count + 1
+        retry_count=_TOTAL_ATTEMPTS
     )
 
 
@@ -127,5 +226,141 @@ async def execute_with_fallback(
     try:
         return await execute_with_retries(coro_func, *args, **kwargs)
     except ResiliencyException as e:
-        logger.warning(f"Returning fallback value due to: {e.message}")
+        logger.warning("Returning fallback value due to: %s", e.message)
         return fallback_value
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the database keeps exhausting its retries.
+    
+    closed -> open after failure_threshold consecutive GatewayTimeoutExceptions
+    (retries exhausted on transient errors; other errors are not counted);
+    open -> half-open once reset_timeout seconds have passed, letting a single
+    probe call through; the probe's outcome closes or re-opens the breaker.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._probe_task: Optional[asyncio.Task] = None
+    
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half-open"."""
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+    
+    async def call(
+        self,
+        coro_func: Callable[..., Awaitable[T]],
+        *args,
+        **kwargs
+    ) -> T:
+        """
+        Run coro_func through execute_with_retries unless the breaker is open.
+        
+        Raises:
+            ServiceUnavailableException: If the breaker is open
+            GatewayTimeoutException: If all retries fail
+        """
+        task = asyncio.current_task()
+        if not self.allow_request():
+            raise ServiceUnavailableException(
+                "Database circuit breaker is open; failing fast"
+            )
+        
+        try:
+            result = await execute_with_retries(coro_func, *args, **kwargs)
+        except GatewayTimeoutException:
+            self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            self.release_probe(task)
+        
+        return result
+    
+    def allow_request(self) -> bool:
+        """
+        Return whether a database call may proceed right now.
+        
+        Always true while closed. Once the reset timeout has passed, the
+        first caller claims the single half-open probe for its task; other
+        tasks are refused until the probe's outcome is recorded, while the
+        probing task itself may make further calls.
+        """
+        if self.opened_at is None:
+            return True
+        task = asyncio.current_task()
+        if self._probing:
+            return task is not None and task is self._probe_task
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._probing = True
+        self._probe_task = task
+        return True
+    
+    def holds_probe(self, task: Optional[asyncio.Task]) -> bool:
+        """Return whether `task` currently holds the half-open probe."""
+        return self._probing and self._probe_task is task
+    
+    def release_probe(self, task: Optional[asyncio.Task]) -> None:
+        """Give up the half-open probe if `task` holds it; no-op otherwise."""
+        if self.holds_probe(task):
+            self._probing = False
+            self._probe_task = None
+    
+    def record_failure(self) -> None:
+        """
+        Count a failed database call, opening the breaker at the threshold.
+        
+        A failure while half-open (after a previous opening) re-opens it
+        immediately.
+        """
+        self.failures += 1
+        reopening = self.opened_at is not None
+        if reopening or self.failures >= self.failure_threshold:
+            if not reopening:
+                logger.error(
+                    "Circuit breaker opened after %s consecutive failures",
+                    self.failures
+                )
+            self.opened_at = time.monotonic()
+    
+    def record_success(self) -> None:
+        """Reset the failure count and close the breaker."""
+        if self.opened_at is not None:
+            logger.info("Circuit breaker closed after successful probe")
+        self.failures = 0
+        self.opened_at = None
+
+
+# Shared breaker for calls against the application's database pool
+db_breaker = CircuitBreaker()
+
+
+async def with_breaker(
+    coro_func: Callable[..., Awaitable[T]],
+    *args,
+    **kwargs
+) -> T:
+    """
+    Execute an async function with retries behind the shared circuit breaker.
+    
+    Raises:
+        ServiceUnavailableException: If the breaker is open
+        GatewayTimeoutException: If all retries fail
+    """
+    return await db_breaker.call(coro_func, *args, **kwargs)
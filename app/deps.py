@@ -0,0 +1,10 @@
+"""
+Shared FastAPI dependencies.
+"""
+
+from fastapi import Request
+
+
+def get_pool(request: Request):
+    """Dependency: the database pool created in the app lifespan (None if unavailable)."""
+    return request.app.state.pool
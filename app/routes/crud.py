@@ -2,113 +2,204 @@
 Dynamic CRUD Routes: Table-agnostic endpoints with resiliency wrapper.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
 import os
 import logging
+import time
 
-from app.core.resiliency import execute_with_retries, GatewayTimeoutException
+from app.deps import get_pool
+from app.core.resiliency import (
+    db_breaker,
+    with_breaker,
+    GatewayTimeoutException,
+    ServiceUnavailableException
+)
 from app.core.database import (
     table_exists,
     execute_insert,
     execute_select,
     execute_update,
-    execute_delete,
-    DatabaseError,
-    InvalidOperationError
+    execute_delete
 )
 from app.schemas.requests import CRUDRequest, UpdateRequest, DeleteRequest
-from app.utils.error_handler import create_error_response, create_success_response, log_error
+from app.utils.decorators import handle_crud_errors
+from app.utils.responses import FastJSONResponse
+from app.utils.error_handler import (
+    constant_error_detail,
+    create_success_response,
+    log_error,
+    raise_api_error
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["crud"])
 
-# Dependency for database pool
-async def get_pool():
-    from main import pool
-    return pool
+# Database name, read once at import
+DB_NAME = os.getenv("DB_NAME")
+
+# Seconds to wait for a free pooled connection before failing with 503
+DB_ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", "5"))
+
+# Unfiltered GET /query results: table_name -> (fetched_at, rows); 0 disables
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "10"))
+_QUERY_CACHE_MAX_ENTRIES = 256
+_QUERY_CACHE: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+# Constant error envelopes, built once
+_db_unavailable = constant_error_detail("503", "Database not available")
+_pool_exhausted = constant_error_detail("503", "Database connection pool exhausted")
+_breaker_open = constant_error_detail("503", "Database temporarily unavailable")
+
+def invalidate_query_cache(table_name: Optional[str] = None) -> None:
+    """
+    Drop cached GET /query results after a write.
+
+    Args:
+        table_name: Table to invalidate; clears the whole cache when omitted
+    """
+    if table_name is None:
+        _QUERY_CACHE.clear()
+    else:
+        _QUERY_CACHE.pop(table_name, None)
+
+
+def _cached_rows(table_name: str) -> Optional[List[Dict[str, Any]]]:
+    """Return cached rows for a table if still within QUERY_CACHE_TTL."""
+    entry = _QUERY_CACHE.get(table_name)
+    if entry is not None and time.monotonic() - entry[0] < QUERY_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+@asynccontextmanager
+async def acquire_connection(pool):
+    """
+    Acquire a pooled connection, failing fast when the pool is unavailable.
+
+    Failed acquisitions count towards the shared circuit breaker, so while
+    MySQL is unreachable requests get a 503 immediately instead of each
+    waiting out the timeout. While half-open only the request holding the
+    breaker's single probe gets through. Its with_breaker calls record their
+    own outcome; a block that queries directly (the /items handlers) counts
+    as a success when it exits without error, which also resets the failure
+    count while the breaker is closed.
+
+    Raises:
+        HTTPException: 503 without a pool, while the circuit breaker is
+            open, if no connection frees up within DB_ACQUIRE_TIMEOUT seconds,
+            or if a new connection cannot be opened
+    """
+    if not pool:
+        raise HTTPException(status_code=503, detail=_db_unavailable())
+    task = asyncio.current_task()
+    if not db_breaker.allow_request():
+        raise HTTPException(status_code=503, detail=_breaker_open())
+
+    try:
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout=DB_ACQUIRE_TIMEOUT)
+        except asyncio.TimeoutError:
+            db_breaker.record_failure()
+            log_error("503", f"No connection available within {DB_ACQUIRE_TIMEOUT}s")
+            raise HTTPException(status_code=503, detail=_pool_exhausted())
+        except Exception as e:
+            db_breaker.record_failure()
+            log_error("503", f"Could not open a database connection: {e}")
+            raise HTTPException(status_code=503, detail=_db_unavailable())
+
+        try:
+            yield conn
+        finally:
+            await pool.release(conn)
+        if db_breaker.opened_at is None or db_breaker.holds_probe(task):
+            db_breaker.record_success()
+    finally:
+        # Free the probe if the request ended without a with_breaker call
+        db_breaker.release_probe(task)
+
+
+async def get_connection(pool = Depends(get_pool)):
+    """
+    Dependency: acquire one pooled connection for the whole request.
+
+    FastAPI caches the dependency per request, so table validation and the
+    operation share a single connection instead of acquiring twice.
+    """
+    async with acquire_connection(pool) as conn:
+        yield conn
+
+
+async def check_table(conn, table_name: str) -> None:
+    """
+    Ensure a table exists, using the given connection.
+
+    Raises:
+        HTTPException: 404 for a missing table, 503/504/500 if the
+            existence check itself fails
+    """
+    try:
+        exists = await with_breaker(table_exists, conn, table_name, DB_NAME)
+    except GatewayTimeoutException as e:
+        raise_api_error(
+            504,
+            "Database timeout during table validation",
+            retry_count=e.retry_count,
+            log_message=str(e)
+        )
+    except ServiceUnavailableException:
+        raise HTTPException(status_code=503, detail=_breaker_open())
+    except Exception as e:
+        raise_api_error(500, "Error validating table", log_message=str(e), exception=e)
+
+    if not exists:
+        raise_api_error(404, f"Table '{table_name}' does not exist")
+
+
+async def validated_table(
+    request: Request,
+    table_name: str,
+    conn = Depends(get_connection)
+) -> str:
+    """
+    Dependency: ensure the table exists, using the request's connection.
+
+    Tables in the startup-warmed app.state.tables set skip the lookup;
+    others (e.g. created since the last refresh) are checked in the DB.
+    """
+    if table_name not in request.app.state.tables:
+        await check_table(conn, table_name)
+    return table_name
 
 
 @router.post("/{table_name}")
+@handle_crud_errors("insert")
 async def create_record(
-    table_name: str,
     request: CRUDRequest,
-    pool = Depends(get_pool)
+    table_name: str = Depends(validated_table),
+    conn = Depends(get_connection)
 ):
     """
     CREATE: POST /api/:tableName
     Accepts { "input": { ...data } } and inserts into the specified table.
     """
-    if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
-    
-    db_name = os.getenv("DB_NAME")
-    
-    # Validate table exists
-    try:
-        exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-        if not exists:
-            response = create_error_response(
-                error_code="404",
-                message=f"Table '{table_name}' does not exist"
-            )
-            raise HTTPException(status_code=404, detail=response.model_dump())
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Database timeout during table validation",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Error validating table"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
-    
-    # Execute insert with retry
-    try:
-        rows_affected = await execute_with_retries(
-            execute_insert, pool, table_name, request.input
-        )
-        response = create_success_response(
-            message=f"Record inserted successfully",
-            data={"rows_affected": rows_affected}
-        )
-        return response.model_dump()
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Insert operation timed out",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except DatabaseError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Database error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during insert"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+    rows_affected = await with_breaker(
+        execute_insert, conn, table_name, request.input
+    )
+    invalidate_query_cache(table_name)
+    response = create_success_response(
+        message="Record inserted successfully",
+        data={"rows_affected": rows_affected}
+    )
+    return FastJSONResponse(response.model_dump())
 
 
 @router.get("/{table_name}/query")
+@handle_crud_errors("select")
 async def retrieve_records(
+    request: Request,
     table_name: str,
     pool = Depends(get_pool)
 ):
@@ -116,316 +207,86 @@ async def retrieve_records(
     RETRIEVE: GET /api/:tableName/query
     Accepts { "input": { ...WHERE_conditions } } for filtering.
     If no input is provided in the request, retrieves all records.
+    Results are cached per table for QUERY_CACHE_TTL seconds; a cache hit
+    does not touch the pool.
     """
-    if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
-    
-    db_name = os.getenv("DB_NAME")
-    
-    # Validate table exists
-    try:
-        exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-        if not exists:
-            response = create_error_response(
-                error_code="404",
-                message=f"Table '{table_name}' does not exist"
-            )
-            raise HTTPException(status_code=404, detail=response.model_dump())
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Database timeout during table validation",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Error validating table"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
-    
-    # Execute select with retry (no WHERE conditions)
-    try:
-        rows = await execute_with_retries(execute_select, pool, table_name, None)
-        response = create_success_response(
-            message=f"Retrieved {len(rows)} record(s)",
-            data=rows
-        )
-        return response.model_dump()
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Select operation timed out",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except DatabaseError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Database error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during select"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+    rows = _cached_rows(table_name)
+    if rows is None:
+        async with acquire_connection(pool) as conn:
+            if table_name not in request.app.state.tables:
+                await check_table(conn, table_name)
+            rows = await with_breaker(execute_select, conn, table_name, None)
+        if QUERY_CACHE_TTL > 0:
+            if len(_QUERY_CACHE) >= _QUERY_CACHE_MAX_ENTRIES:
+                _QUERY_CACHE.clear()
+            _QUERY_CACHE[table_name] = (time.monotonic(), rows)
+    response = create_success_response(
+        message=f"Retrieved {len(rows)} record(s)",
+        data=rows
+    )
+    return FastJSONResponse(response.model_dump())
 
 
 @router.post("/{table_name}/query")
+@handle_crud_errors("select")
 async def retrieve_records_with_filter(
-    table_name: str,
     request: CRUDRequest,
-    pool = Depends(get_pool)
+    table_name: str = Depends(validated_table),
+    conn = Depends(get_connection)
 ):
     """
     RETRIEVE with WHERE: POST /api/:tableName/query
     Accepts { "input": { ...WHERE_conditions } } for filtering.
     """
-    if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
-    
-    db_name = os.getenv("DB_NAME")
-    
-    # Validate table exists
-    try:
-        exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-        if not exists:
-            response = create_error_response(
-                error_code="404",
-                message=f"Table '{table_name}' does not exist"
-            )
-            raise HTTPException(status_code=404, detail=response.model_dump())
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Database timeout during table validation",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Error validating table"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
-    
-    # Execute select with retry and WHERE conditions
-    try:
-        rows = await execute_with_retries(
-            execute_select, pool, table_name, request.input
-        )
-        response = create_success_response(
-            message=f"Retrieved {len(rows)} record(s)",
-            data=rows
-        )
-        return response.model_dump()
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Select operation timed out",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except DatabaseError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Database error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during select"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+    rows = await with_breaker(
+        execute_select, conn, table_name, request.input
+    )
+    response = create_success_response(
+        message=f"Retrieved {len(rows)} record(s)",
+        data=rows
+    )
+    return FastJSONResponse(response.model_dump())
 
 
 @router.put("/{table_name}")
+@handle_crud_errors("update")
 async def update_record(
-    table_name: str,
     request: UpdateRequest,
-    pool = Depends(get_pool)
+    table_name: str = Depends(validated_table),
+    conn = Depends(get_connection)
 ):
     """
     UPDATE: PUT /api/:tableName
     Accepts { "input": { ...new_values }, "where": { ...conditions } }
     """
-    if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
-    
-    db_name = os.getenv("DB_NAME")
-    
-    # Validate table exists
-    try:
-        exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-        if not exists:
-            response = create_error_response(
-                error_code="404",
-                message=f"Table '{table_name}' does not exist"
-            )
-            raise HTTPException(status_code=404, detail=response.model_dump())
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Database timeout during table validation",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Error validating table"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
-    
-    # Execute update with retry
-    try:
-        rows_affected = await execute_with_retries(
-            execute_update, pool, table_name, request.input, request.where
-        )
-        response = create_success_response(
-            message=f"Record updated successfully",
-            data={"rows_affected": rows_affected}
-        )
-        return response.model_dump()
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Update operation timed out",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except InvalidOperationError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Invalid operation: {str(e)}"
-        )
-        log_error("400", str(e))
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except DatabaseError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Database error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during update"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+    rows_affected = await with_breaker(
+        execute_update, conn, table_name, request.input, request.where
+    )
+    invalidate_query_cache(table_name)
+    response = create_success_response(
+        message="Record updated successfully",
+        data={"rows_affected": rows_affected}
+    )
+    return FastJSONResponse(response.model_dump())
 
 
 @router.delete("/{table_name}")
+@handle_crud_errors("delete")
 async def delete_record(
-    table_name: str,
     request: DeleteRequest,
-    pool = Depends(get_pool)
+    table_name: str = Depends(validated_table),
+    conn = Depends(get_connection)
 ):
     """
     DELETE: DELETE /api/:tableName
     Accepts { "input": { ...WHERE_conditions } }
     """
-    if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
-    
-    db_name = os.getenv("DB_NAME")
-    
-    # Validate table exists
-    try:
-        exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-        if not exists:
-            response = create_error_response(
-                error_code="404",
-                message=f"Table '{table_name}' does not exist"
-            )
-            raise HTTPException(status_code=404, detail=response.model_dump())
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Database timeout during table validation",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Error validating table"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
-    
-    # Execute delete with retry
-    try:
-        rows_affected = await execute_with_retries(
-            execute_delete, pool, table_name, request.input
-        )
-        response = create_success_response(
-            message=f"Record deleted successfully",
-            data={"rows_affected": rows_affected}
-        )
-        return response.model_dump()
-    except GatewayTimeoutException as e:
-        response = create_error_response(
-            error_code="504",
-            message="Delete operation timed out",
-            retry_count=e.retry_count
-        )
-        log_error("504", str(e))
-        raise HTTPException(status_code=504, detail=response.model_dump())
-    except InvalidOperationError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Invalid operation: {str(e)}"
-        )
-        log_error("400", str(e))
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except DatabaseError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"Database error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
-    except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during delete"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+    rows_affected = await with_breaker(
+        execute_delete, conn, table_name, request.input
+    )
+    invalidate_query_cache(table_name)
+    response = create_success_response(
+        message="Record deleted successfully",
+        data={"rows_affected": rows_affected}
+    )
+    return FastJSONResponse(response.model_dump())
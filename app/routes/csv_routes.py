@@ -5,17 +5,22 @@ CSV Routes: Import and Export endpoints.
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 import logging
 
+from app.deps import get_pool
+from app.routes.crud import invalidate_query_cache
 from app.services.csv_service import batch_import_csv, export_to_csv, CSVError
-from app.utils.error_handler import create_error_response, create_success_response, log_error
+from app.utils.responses import FastJSONResponse
+from app.utils.error_handler import (
+    constant_error_detail,
+    create_success_response,
+    raise_api_error
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/batch", tags=["csv"])
 
-
-# Dependency for database pool
-async def get_pool():
-    from main import pool
-    return pool
+# Constant error envelopes, built once
+_db_unavailable = constant_error_detail("503", "Database not available")
+_not_a_csv = constant_error_detail("400", "File must be a CSV file")
 
 
 @router.post("/import")
@@ -30,40 +35,23 @@ async def import_csv(
     Performs batch inserts with error tracking.
     """
     if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
+        raise HTTPException(status_code=503, detail=_db_unavailable())
     
     if not file.filename or not file.filename.endswith('.csv'):
-        response = create_error_response(
-            error_code="400",
-            message="File must be a CSV file"
-        )
-        raise HTTPException(status_code=400, detail=response.model_dump())
+        raise HTTPException(status_code=400, detail=_not_a_csv())
     
     try:
         import_stats = await batch_import_csv(file, pool)
+        invalidate_query_cache(import_stats["table_name"])
         response = create_success_response(
             message="CSV import completed",
             data=import_stats
         )
-        return response.model_dump()
+        return FastJSONResponse(response.model_dump())
     except CSVError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"CSV import error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
+        raise_api_error(400, f"CSV import error: {str(e)}", log_message=str(e), exception=e)
     except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during CSV import"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+        raise_api_error(500, "Unexpected error during CSV import", log_message=str(e), exception=e)
 
 
 @router.get("/{table_name}/export")
@@ -77,25 +65,11 @@ async def export_csv(
     Uses streaming to handle large datasets efficiently.
     """
     if not pool:
-        response = create_error_response(
-            error_code="503",
-            message="Database not available"
-        )
-        raise HTTPException(status_code=503, detail=response.model_dump())
+        raise HTTPException(status_code=503, detail=_db_unavailable())
     
     try:
         return await export_to_csv(table_name, pool)
     except CSVError as e:
-        response = create_error_response(
-            error_code="400",
-            message=f"CSV export error: {str(e)}"
-        )
-        log_error("400", str(e), e)
-        raise HTTPException(status_code=400, detail=response.model_dump())
+        raise_api_error(400, f"CSV export error: {str(e)}", log_message=str(e), exception=e)
     except Exception as e:
-        response = create_error_response(
-            error_code="500",
-            message="Unexpected error during CSV export"
-        )
-        log_error("500", str(e), e)
-        raise HTTPException(status_code=500, detail=response.model_dump())
+        raise_api_error(500, "Unexpected error during CSV export", log_message=str(e), exception=e)
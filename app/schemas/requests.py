@@ -2,15 +2,21 @@
 Pydantic schemas for request/response validation.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, Optional
 
 
+# Request bodies are read-only once parsed; unknown keys are dropped
+_REQUEST_CONFIG = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
+
 class CRUDRequest(BaseModel):
     """
     Base request schema for CRUD operations.
     Strict format: { "input": { ...data } }
     """
+    model_config = _REQUEST_CONFIG
+
     input: Dict[str, Any]
 
 
@@ -18,6 +24,8 @@ class UpdateRequest(BaseModel):
     """
     Update request schema: { "input": { ...new_values }, "where": { ...conditions } }
     """
+    model_config = _REQUEST_CONFIG
+
     input: Dict[str, Any]
     where: Dict[str, Any]
 
@@ -26,4 +34,6 @@ class DeleteRequest(BaseModel):
     """
     Delete request schema: { "input": { ...WHERE_conditions } }
     """
+    model_config = _REQUEST_CONFIG
+
     input: Dict[str, Any]
@@ -0,0 +1,85 @@
+"""
+Batch Loader: Coalesce concurrent single-key lookups into one batched fetch.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """
+    DataLoader-style micro-batcher.
+
+    Keys requested within `window` seconds of each other are fetched with a
+    single call to `fetch_many(keys) -> {key: value}`; concurrent requests
+    for the same key share one result. A batch is dispatched early once it
+    reaches `max_batch` keys.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        window: float = 0.001,
+        max_batch: int = 500
+    ):
+        self.fetch_many = fetch_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Return the value for `key`, or None if fetch_many did not return it.
+
+        Raises:
+            Exception: Whatever fetch_many raised for the batch
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+        # Shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Hand the pending keys to a fetch task and start a new batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        """
+        Fetch one batch and settle its futures.
+
+        If the fetch task itself is cancelled (e.g. at shutdown), every
+        unsettled future is cancelled too so no caller waits forever.
+        """
+        try:
+            values = await self.fetch_many(list(batch))
+        except Exception as e:
+            logger.error("Batch fetch of %s keys failed: %s", len(batch), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        finally:
+            for future in batch.values():
+                if not future.done():
+                    future.cancel()
@@ -5,37 +5,67 @@ Handles large files efficiently to prevent memory overflow.
 
 import csv
 import io
+import itertools
 import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 from fastapi import UploadFile
 from fastapi.responses import StreamingResponse
 
 from app.core.resiliency import execute_with_retries, GatewayTimeoutException
 from app.core.database import (
     table_exists,
-    execute_insert,
-    execute_select,
-    DatabaseError
+    get_table_columns,
+    execute_bulk_insert,
+    execute_select_chunks
 )
 
 logger = logging.getLogger(__name__)
 
+# Target database for schema lookups (fixed for the process lifetime)
+DB_NAME = os.getenv("DB_NAME")
+
+# Rows fetched from the server-side cursor and written per streamed chunk
+EXPORT_CHUNK_ROWS = 1000
+
 
 class CSVError(Exception):
     """Base exception for CSV operations."""
     pass
 
 
-async def parse_csv_file(file: UploadFile) -> tuple[str, List[Dict[str, Any]]]:
+def _fit_rows(reader: Iterator[List[str]], width: int) -> Iterator[List[Any]]:
     """
-    Parse a CSV file and extract table name and records.
+    Skip blank lines and pad short rows with None, as DictReader would.
+    
+    Rows longer than the header are passed through unchanged so that
+    execute_bulk_insert reports them as failed records.
+    """
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [None] * (width - len(row))
+        yield row
+
+
+async def parse_csv_file(
+    file: UploadFile
+) -> Tuple[str, List[str], Iterator[List[Any]]]:
+    """
+    Open a CSV upload for streaming and extract table name and header.
+    
+    Rows are decoded lazily from the spooled upload, so the file is read
+    once and never held in memory as a whole. They are yielded as value
+    lists in header order, without building a dict per row. Only the
+    header and first row are read here; execute_bulk_insert pulls the rest
+    off the event loop and reports decode errors past this point.
     
     Args:
         file: Uploaded CSV file
     
     Returns:
-        Tuple of (table_name, list_of_records)
+        Tuple of (table_name, fieldnames, row_iterator)
     
     Raises:
         CSVError: If CSV parsing fails
@@ -46,24 +76,26 @@ async def parse_csv_file(file: UploadFile) -> tuple[str, List[Dict[str, Any]]]:
         table_name = os.path.splitext(filename)[0]
         logger.info(f"Parsing CSV file: {filename} -> table: {table_name}")
         
-        # Read file content
-        content = await file.read()
-        text = content.decode('utf-8')
+        # Stream the upload through a text decoder
+        file.file.seek(0)
+        text_stream = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+        reader = csv.reader(text_stream)
         
-        # Parse CSV
-        lines = text.strip().split('\n')
-        if not lines:
+        fieldnames = next(reader, None)
+        while fieldnames == []:
+            fieldnames = next(reader, None)
+        if not fieldnames:
             raise CSVError("CSV file is empty")
         
-        reader = csv.DictReader(io.StringIO(text))
-        records = list(reader)
-        
-        if not records:
+        rows = _fit_rows(reader, len(fieldnames))
+        first_row = next(rows, None)
+        if first_row is None:
             raise CSVError("CSV file has no data rows (only headers)")
         
-        logger.info(f"Parsed {len(records)} records from {filename}")
-        return table_name, records
+        return table_name, fieldnames, itertools.chain([first_row], rows)
     
+    except CSVError:
+        raise
     except Exception as e:
         logger.error(f"Error parsing CSV file: {e}")
         raise CSVError(f"Failed to parse CSV: {str(e)}")
@@ -89,46 +121,26 @@ async def batch_import_csv(
     if not pool:
         raise CSVError("Database pool is not available")
     
-    db_name = os.getenv("DB_NAME")
-    
     try:
         # Parse CSV file
-        table_name, records = await parse_csv_file(file)
+        table_name, fieldnames, rows = await parse_csv_file(file)
         
         # Validate table exists
         try:
-            exists = await execute_with_retries(table_exists, pool, table_name, db_name)
+            exists = await execute_with_retries(table_exists, pool, table_name, DB_NAME)
             if not exists:
                 raise CSVError(f"Table '{table_name}' does not exist in database")
         except GatewayTimeoutException as e:
             raise CSVError(f"Database timeout while validating table: {str(e)}")
         
-        # Batch insert records
-        total_records = len(records)
-        inserted = 0
-        failed = 0
-        errors = []
-        
-        for index, record in enumerate(records, 1):
-            try:
-                await execute_with_retries(execute_insert, pool, table_name, record)
-                inserted += 1
-                logger.debug(f"Inserted record {index}/{total_records} into {table_name}")
-            except GatewayTimeoutException as e:
-                failed += 1
-                error_msg = f"Record {index}: Timeout - {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
-            except DatabaseError as e:
-                failed += 1
-                error_msg = f"Record {index}: {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
-            except Exception as e:
-                failed += 1
-                error_msg = f"Record {index}: Unexpected error - {str(e)}"
-                logger.warning(error_msg)
-                errors.append(error_msg)
+        # Bulk insert records in multi-row chunks
+        stats = await execute_bulk_insert(pool, table_name, fieldnames, rows)
+        total_records = stats["total_records"]
+        inserted = stats["inserted"]
+        failed = stats["failed"]
+        errors = stats["errors"]
+        for error_msg in errors:
+            logger.warning(error_msg)
         
         logger.info(
             f"Batch import complete: {inserted} inserted, "
@@ -170,44 +182,42 @@ async def export_to_csv(
     if not pool:
         raise CSVError("Database pool is not available")
     
-    db_name = os.getenv("DB_NAME")
-    
     try:
-        # Validate table exists
+        # Validate table exists (served from the schema cache)
         try:
-            exists = await execute_with_retries(table_exists, pool, table_name, db_name)
-            if not exists:
+            columns = await execute_with_retries(
+                get_table_columns, pool, table_name, DB_NAME
+            )
+            if not columns:
                 raise CSVError(f"Table '{table_name}' does not exist")
         except GatewayTimeoutException as e:
             raise CSVError(f"Database timeout while validating table: {str(e)}")
         
-        # Fetch all records
-        try:
-            rows = await execute_with_retries(execute_select, pool, table_name, None)
-        except GatewayTimeoutException as e:
-            raise CSVError(f"Database timeout while exporting data: {str(e)}")
-        
-        logger.info(f"Exporting {len(rows)} records from {table_name}")
+        logger.info(f"Exporting records from {table_name}")
         
-        # Stream CSV data
+        # Stream CSV data straight from a server-side cursor
         async def generate_csv():
-            if not rows:
-                yield ""
-                return
-            
-            # Write header
-            fieldnames = rows[0].keys()
             buffer = io.StringIO()
-            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(buffer)
+            
+            chunks = execute_select_chunks(
+                pool, table_name, chunk_size=EXPORT_CHUNK_ROWS,
+                dict_rows=False, with_header=True
+            )
+            
+            # Header from the cursor description, so it matches the
+            # positional rows even if the cached schema is stale
+            writer.writerow(await anext(chunks))
             yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
             
-            # Write data rows
-            for row in rows:
-                buffer = io.StringIO()
-                writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-                writer.writerow(row)
+            # Each fetched chunk of tuples is written in one call
+            async for rows in chunks:
+                writer.writerows(rows)
                 yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
         
         filename = f"{table_name}_export.csv"
         return StreamingResponse(
@@ -0,0 +1,65 @@
+"""
+Route Decorators: Shared exception-to-HTTP mapping for CRUD handlers.
+"""
+
+import functools
+import logging
+from typing import Callable, Any, Awaitable
+
+from fastapi import HTTPException
+
+from app.core.resiliency import GatewayTimeoutException, ServiceUnavailableException
+from app.core.database import DatabaseError, InvalidOperationError
+from app.utils.error_handler import raise_api_error
+
+logger = logging.getLogger(__name__)
+
+
+def handle_crud_errors(op_name: str) -> Callable:
+    """
+    Map database exceptions raised by a CRUD handler to HTTP errors.
+
+    GatewayTimeoutException -> 504, ServiceUnavailableException -> 503,
+    InvalidOperationError/DatabaseError -> 400, any other exception -> 500.
+    HTTPExceptions pass through unchanged.
+
+    Args:
+        op_name: Operation name used in error messages (e.g., "insert")
+
+    Returns:
+        Decorator for async route handlers
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except GatewayTimeoutException as e:
+                raise_api_error(
+                    504,
+                    f"{op_name.capitalize()} operation timed out",
+                    retry_count=e.retry_count,
+                    log_message=str(e)
+                )
+            except ServiceUnavailableException as e:
+                raise_api_error(
+                    503,
+                    "Database temporarily unavailable",
+                    retry_count=e.retry_count,
+                    log_message=str(e)
+                )
+            except InvalidOperationError as e:
+                raise_api_error(400, f"Invalid operation: {str(e)}", log_message=str(e))
+            except DatabaseError as e:
+                raise_api_error(400, f"Database error: {str(e)}", log_message=str(e), exception=e)
+            except Exception as e:
+                raise_api_error(
+                    500,
+                    f"Unexpected error during {op_name}",
+                    log_message=str(e),
+                    exception=e
+                )
+        return wrapper
+    return decorator
@@ -3,13 +3,27 @@ Error Handling Utilities: Standardized error response formatting.
 Includes timestamp, error_code, and retry_count in all responses.
 """
 
+from fastapi import HTTPException
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional, Any, Dict
+from datetime import datetime, timezone
+from typing import Optional, Any, Callable, Dict, NoReturn
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Last formatted timestamp: [epoch_second, iso_string]
+_ts_cache = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601, formatted at most once per second."""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
 
 class ErrorResponse(BaseModel):
     """Standardized error response schema."""
@@ -47,7 +61,7 @@ def create_error_response(
         ErrorResponse object
     """
     return ErrorResponse(
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=_now_iso(),
         error_code=error_code,
         message=message,
         retry_count=retry_count,
@@ -55,6 +69,26 @@ def create_error_response(
     )
 
 
+def constant_error_detail(error_code: str, message: str) -> Callable[[], Dict[str, Any]]:
+    """
+    Prebuild the envelope for an error whose code and message never change.
+    
+    Args:
+        error_code: HTTP error code or custom code
+        message: Error message
+    
+    Returns:
+        Callable returning a fresh-timestamped copy of the envelope dict,
+        skipping model construction and serialization
+    """
+    template = create_error_response(error_code=error_code, message=message).model_dump()
+    
+    def build() -> Dict[str, Any]:
+        return {**template, "timestamp": _now_iso()}
+    
+    return build
+
+
 def create_success_response(
     message: str,
     data: Optional[Any] = None,
@@ -72,7 +106,7 @@ def create_success_response(
         SuccessResponse object
     """
     return SuccessResponse(
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=_now_iso(),
         message=message,
         data=data,
         retry_count=retry_count
@@ -88,7 +122,39 @@ def log_error(error_code: str, message: str, exception: Optional[Exception] = No
         message: Error message
         exception: Optional exception object for stack trace
     """
-    if exception:
-        logger.error(f"[{error_code}] {message}", exc_info=exception)
-    else:
-        logger.error(f"[{error_code}] {message}")
+    logger.error("[%s] %s", error_code, message, exc_info=exception)
+
+
+def raise_api_error(
+    status_code: int,
+    message: str,
+    retry_count: int = 0,
+    log_message: Optional[str] = None,
+    exception: Optional[Exception] = None
+) -> NoReturn:
+    """
+    Log (optionally) and raise an HTTPException carrying the error envelope.
+    
+    The detail dict has the same shape as ErrorResponse.model_dump() but is
+    built directly, without model validation.
+    
+    Args:
+        status_code: HTTP status; also used as the envelope's error_code
+        message: Client-facing error message
+        retry_count: Number of retries attempted
+        log_message: Message to log via log_error; nothing is logged when omitted
+        exception: Optional exception object for stack trace
+    
+    Raises:
+        HTTPException: Always
+    """
+    error_code = str(status_code)
+    if log_message is not None:
+        log_error(error_code, log_message, exception)
+    raise HTTPException(status_code=status_code, detail={
+        "timestamp": _now_iso(),
+        "error_code": error_code,
+        "message": message,
+        "retry_count": retry_count,
+        "details": None,
+    })
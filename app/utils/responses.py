@@ -0,0 +1,92 @@
+"""
+Response Classes: orjson-backed JSON rendering for API payloads.
+"""
+
+import datetime
+import decimal
+import hashlib
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode MySQL column types orjson does not handle, matching jsonable_encoder."""
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        return value.decode()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes, with orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when it is installed."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+
+    Handlers that return this directly also skip FastAPI's jsonable_encoder
+    pass over the payload.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def make_etag(body: bytes, weak: bool = False) -> str:
+    """Quoted ETag header value derived from a content hash."""
+    tag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    cache_control: str
+) -> Response:
+    """
+    Serve pre-encoded JSON with validators, or 304 if the client's copy is current.
+
+    Args:
+        request: Incoming request, checked for If-None-Match
+        body: Encoded JSON payload
+        etag: ETag for the payload (see make_etag)
+        cache_control: Cache-Control header value
+
+    Returns:
+        304 Response without a body, or 200 Response with the payload
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,71 @@
+"""
+Shared pytest fixtures.
+
+Session fixtures are created once per process, so under pytest-xdist
+(`pytest -n auto`) each worker builds its own client. Tests only read
+from them; anything a test changes (module caches, the breaker) is
+patched with the function-scoped monkeypatch fixture and undone after.
+"""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import app
+
+HOMEPAGE_FILE = os.path.join("demo_data", "homepage.json")
+
+
+def pytest_configure(config):
+    """Fail the whole run up front if the homepage fixture data is missing."""
+    if not os.path.exists(HOMEPAGE_FILE):
+        raise pytest.UsageError(
+            f"{HOMEPAGE_FILE} missing; run pytest from the repository root"
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests that use the TestClient as integration, the rest as unit."""
+    for item in items:
+        if "client" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.integration)
+        else:
+            item.add_marker(pytest.mark.unit)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and app lifespan) for the whole test session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def no_db(monkeypatch):
+    """
+    Run every test without a connection pool.
+
+    Even when .env points at a reachable MySQL, DB-backed routes take their
+    immediate 503 path instead of opening sockets. Tests that need a pool
+    patch in their own fake after this runs.
+    """
+    monkeypatch.setattr(main, "pool", None)
+    monkeypatch.setattr(app.state, "pool", None)
+
+
+@pytest.fixture(scope="session")
+def homepage_response(client):
+    """GET /api/homepage, requested once and shared by the homepage tests."""
+    return client.get("/api/homepage")
+
+
+@pytest.fixture(scope="session")
+def registered_routes():
+    """(METHOD, path template) for every route in the OpenAPI schema, built once."""
+    return {
+        (method.upper(), path)
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+    }
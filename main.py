@@ -1,20 +1,32 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import aiomysql
 import asyncio
+import itertools
 import json
 import os
 import logging
+import time
 from contextlib import asynccontextmanager
+from functools import lru_cache
+
+# Load environment variables from .env file before app modules read them
+load_dotenv()
 
 # Import new modules
 from app.routes import crud, csv_routes
-
-# Load environment variables from .env file
-load_dotenv()
+from app.routes.crud import acquire_connection
+from app.core.database import fetch_table_names
+from app.services.batch_loader import BatchLoader
+from app.utils.responses import (
+    FastJSONResponse,
+    conditional_response,
+    json_dumps,
+    json_loads,
+    make_etag
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,12 +39,63 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 DB_PORT = os.getenv("DB_PORT")
 
+def worker_count() -> int:
+    """Worker processes sharing the pool budget: WEB_CONCURRENCY, else 1."""
+    return max(1, int(os.getenv("WEB_CONCURRENCY") or 1))
+
+# Connection pool sizing. DB_POOL_MAX is the budget for the whole
+# deployment and is split across WEB_CONCURRENCY worker processes so the
+# total stays under max_connections. A plain `uvicorn main:app` is one
+# process and keeps the full budget; the __main__ runner exports the
+# worker count it starts so every worker divides by the same value.
+_WORKERS = worker_count()
+DB_POOL_MAX = max(1, int(os.getenv("DB_POOL_MAX", "50")) // _WORKERS)
+DB_POOL_MIN = min(int(os.getenv("DB_POOL_MIN", "10")), DB_POOL_MAX)
+# aiomysql does not ping on acquire; idle connections older than this are
+# reopened instead, so keep it below the server's wait_timeout
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+# Seconds between refreshes of the known-table set
+TABLES_REFRESH_INTERVAL = float(os.getenv("TABLES_REFRESH_INTERVAL", "60"))
+
+# Cache-Control for /api/homepage (static file) and GET /items (live rows,
+# so clients revalidate every time and get a 304 when nothing changed)
+HOMEPAGE_CACHE_CONTROL = "public, max-age=60"
+ITEMS_CACHE_CONTROL = "no-cache"
+
+# GET /items/{id} cache: item_id -> (fetched_at, Item); writes invalidate.
+# The cache is per worker process and a write only invalidates its own
+# worker, so other workers may serve the old row for up to ITEM_CACHE_TTL
+# seconds; keep it short. 0 disables.
+ITEM_CACHE_TTL = float(os.getenv("ITEM_CACHE_TTL", "5"))
+_ITEM_CACHE_MAX_ENTRIES = 10_000
+_item_cache = {}
+# item_id -> write generation; a read only caches its row if no write
+# to that id landed while the lookup was in flight. Values come from one
+# global counter, so they stay unique even after the dict is cleared
+_item_generation = {}
+_item_write_seq = itertools.count(1)
+
 # Database connection pool
 pool = None
 
+async def refresh_tables(app: FastAPI, interval: float):
+    """Periodically reload the set of tables the CRUD routes accept without a lookup."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            app.state.tables = await fetch_table_names(pool, DB_NAME)
+        except Exception as e:
+            logger.warning(f"Failed to refresh table list: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global pool
+    refresh_task = None
+    try:
+        app.state.homepage = load_homepage()
+    except Exception as e:
+        logger.warning(f"Failed to preload homepage data: {e}")
     logger.info("Creating database connection pool.")
     try:
         # Only attempt connection if config is present
@@ -44,6 +107,9 @@ async def lifespan(app: FastAPI):
                 password=DB_PASSWORD,
                 db=DB_NAME,
                 autocommit=True,
+                minsize=DB_POOL_MIN,
+                maxsize=DB_POOL_MAX,
+                pool_recycle=DB_POOL_RECYCLE,
             )
             logger.info("Database connection pool created.")
         else:
@@ -51,15 +117,32 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to create database connection pool: {e}")
 
+    app.state.pool = pool
+
+    if pool:
+        try:
+            app.state.tables = await fetch_table_names(pool, DB_NAME)
+        except Exception as e:
+            logger.warning(f"Failed to load table list: {e}")
+        refresh_task = asyncio.create_task(refresh_tables(app, TABLES_REFRESH_INTERVAL))
+
     yield
 
+    if refresh_task:
+        refresh_task.cancel()
     if pool:
         logger.info("Closing database connection pool.")
         pool.close()
         await pool.wait_closed()
         logger.info("Database connection pool closed.")
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# Shared with the route dependencies; set in lifespan once the pool is up
+app.state.pool = None
+# Tables known to exist, warmed at startup; empty until the pool is up
+app.state.tables = frozenset()
+# (body, etag) for /api/homepage, loaded at startup or on first request
+app.state.homepage = None
 
 # Add CORS middleware
 app.add_middleware(
@@ -74,46 +157,68 @@ app.add_middleware(
 app.include_router(crud.router)
 app.include_router(csv_routes.router)
 
+def load_homepage():
+    """
+    Read demo_data/homepage.json and pre-encode it for serving.
+
+    Returns:
+        Tuple of (JSON bytes, ETag header value)
+    """
+    file_path = os.path.join("demo_data", "homepage.json")
+    logger.debug(f"Trying to open file: {file_path}")
+    with open(file_path, 'rb') as f:
+        users = json_loads(f.read())
+    body = json_dumps(users)
+    return body, make_etag(body)
+
 @app.get("/api/homepage")
-async def get_homepage():
+async def get_homepage(request: Request):
     """
     Retrieves user data from a JSON file.
 
-    Attempts to read and parse user data from 'demo_data/homepage.json'.
-    Returns the data as a JSON response. Handles potential errors like
-    file not found, JSON decoding errors, and other unexpected exceptions.
+    The file is read and encoded once (at startup, or on first request if
+    startup could not load it) and served from memory afterwards, with an
+    ETag so clients can revalidate with If-None-Match. Handles potential
+    errors like file not found, JSON decoding errors, and other unexpected
+    exceptions.
     """
     try:
-        # Construct the file path
-        file_path = os.path.join("demo_data", "homepage.json")
-        logger.debug(f"Trying to open file: {file_path}")
-
-        # Read and parse the JSON file
-        with open(file_path, 'r') as f:
-            users = json.load(f)
-
-        # Return the user data
-        return JSONResponse(content=users)
+        if app.state.homepage is None:
+            app.state.homepage = load_homepage()
+        body, etag = app.state.homepage
+        return conditional_response(request, body, etag, HOMEPAGE_CACHE_CONTROL)
 
     except FileNotFoundError as e:
         logger.error(f"FileNotFoundError: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={"error": "File not found. Please ensure 'demo_data/homepage.json' exists."},
             status_code=404
         )
     except json.JSONDecodeError as e:
         logger.error(f"JSONDecodeError: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={"error": "Error decoding JSON. Ensure the file contains valid JSON data."},
             status_code=400
         )
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={"error": f"An unexpected error occurred: {str(e)}"},
             status_code=500
         )
 
+# SQL for the /items endpoints, built once
+SQL_LIST_ITEMS = "SELECT id, name, description FROM items LIMIT %s OFFSET %s"
+SQL_INSERT_ITEM = "INSERT INTO items (name, description) VALUES (%s, %s)"
+SQL_UPDATE_ITEM = "UPDATE items SET name = %s, description = %s WHERE id = %s"
+SQL_DELETE_ITEM = "DELETE FROM items WHERE id = %s"
+
+@lru_cache(maxsize=128)
+def sql_get_items(count: int) -> str:
+    """SELECT for `count` ids via one IN list, cached per list length."""
+    placeholders = ", ".join(["%s"] * count)
+    return f"SELECT id, name, description FROM items WHERE id IN ({placeholders})"
+
 class ItemCreate(BaseModel):
     name: str
     description: str
@@ -121,86 +226,130 @@ class ItemCreate(BaseModel):
 class Item(ItemCreate):
     id: int
 
+class ItemsBatch(BaseModel):
+    ids: list[int] = Field(max_length=1000)
+
+async def fetch_items_by_id(ids: list[int]) -> dict[int, dict]:
+    """Load the given items as plain dicts with a single IN query, keyed by id."""
+    async with acquire_connection(pool) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cur:
+            await cur.execute(sql_get_items(len(ids)), ids)
+            results = await cur.fetchall()
+    return {row["id"]: row for row in results}
+
+# Coalesces concurrent GET /items/{id} lookups into batched IN queries
+app.state.item_loader = BatchLoader(fetch_items_by_id)
+
+# Static payload, encoded once; each request only wraps the bytes
+_ROOT_BODY = json_dumps({"message": "Hello, World"})
+
 @app.get("/")
 async def read_root():
-    return {"message": "Hello, World"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
+@app.exception_handler(aiomysql.MySQLError)
+async def mysql_error_handler(request: Request, exc: aiomysql.MySQLError):
+    """Turn driver errors from the /items handlers into a single 500 response."""
+    logger.error(f"Database error on {request.method} {request.url.path}: {exc}")
+    return FastJSONResponse({"detail": "Internal Server Error"}, status_code=500)
+
+def _invalidate_item(item_id: int) -> None:
+    """Drop a cached item and bump its generation so in-flight reads don't re-cache it."""
+    _item_cache.pop(item_id, None)
+    if len(_item_generation) >= _ITEM_CACHE_MAX_ENTRIES:
+        _item_generation.clear()
+    _item_generation[item_id] = next(_item_write_seq)
+
+# Read endpoints return rows as dicts in a FastJSONResponse; returning a
+# Response skips response_model validation, which is kept for the schema docs
 @app.get("/items/{item_id}", response_model=Item)
 async def read_item(item_id: int):
     if not pool:
         raise HTTPException(status_code=503, detail="Database not configured")
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("SELECT id, name, description FROM items WHERE id = %s", (item_id,))
-                result = await cur.fetchone()
-                if result:
-                    return Item(id=result[0], name=result[1], description=result[2])
-                else:
-                    raise HTTPException(status_code=404, detail="Item not found")
-    except Exception as e:
-        logger.error(f"Error reading item with id {item_id}: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    cached = _item_cache.get(item_id)
+    if cached is not None and time.monotonic() - cached[0] < ITEM_CACHE_TTL:
+        return FastJSONResponse(cached[1])
+    generation = _item_generation.get(item_id, 0)
+    # Concurrent lookups (including concurrent misses for the same id)
+    # are coalesced into one IN query per batch window
+    item = await app.state.item_loader.load(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if ITEM_CACHE_TTL > 0 and _item_generation.get(item_id, 0) == generation:
+        if len(_item_cache) >= _ITEM_CACHE_MAX_ENTRIES:
+            _item_cache.clear()
+        _item_cache[item_id] = (time.monotonic(), item)
+    return FastJSONResponse(item)
 
 @app.post("/items", response_model=Item)
 async def create_item(item: ItemCreate):
     if not pool:
         raise HTTPException(status_code=503, detail="Database not configured")
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("INSERT INTO items (name, description) VALUES (%s, %s)", (item.name, item.description))
-                item_id = cur.lastrowid
-                return Item(id=item_id, name=item.name, description=item.description)
-    except Exception as e:
-        logger.error(f"Error creating item: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    async with acquire_connection(pool) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(SQL_INSERT_ITEM, (item.name, item.description))
+            item_id = cur.lastrowid
+            return Item.model_construct(id=item_id, name=item.name, description=item.description)
 
 @app.put("/items/{item_id}", response_model=Item)
 async def update_item(item_id: int, item: ItemCreate):
     if not pool:
         raise HTTPException(status_code=503, detail="Database not configured")
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("UPDATE items SET name = %s, description = %s WHERE id = %s", (item.name, item.description, item_id))
-                return Item(id=item_id, name=item.name, description=item.description)
-    except Exception as e:
-        logger.error(f"Error updating item with id {item_id}: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    async with acquire_connection(pool) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(SQL_UPDATE_ITEM, (item.name, item.description, item_id))
+            _invalidate_item(item_id)
+            return Item.model_construct(id=item_id, name=item.name, description=item.description)
 
 @app.delete("/items/{item_id}")
 async def delete_item(item_id: int):
     if not pool:
         raise HTTPException(status_code=503, detail="Database not configured")
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("DELETE FROM items WHERE id = %s", (item_id,))
-                if cur.rowcount == 0:
-                    raise HTTPException(status_code=404, detail="Item not found")
-                return {"message": "Item deleted"}
-    except Exception as e:
-        logger.error(f"Error deleting item with id {item_id}: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    async with acquire_connection(pool) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(SQL_DELETE_ITEM, (item_id,))
+            _invalidate_item(item_id)
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Item not found")
+            return {"message": "Item deleted"}
 
 
+@app.post("/items/batch", response_model=list[Item])
+async def read_items_batch(req: ItemsBatch):
+    """Fetch several items in one IN query; results follow the order of `ids`, skipping missing ones."""
+    if not pool:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    if not req.ids:
+        return []
+    by_id = await fetch_items_by_id(list(dict.fromkeys(req.ids)))
+    return FastJSONResponse([by_id[item_id] for item_id in req.ids if item_id in by_id])
+
 @app.get("/items", response_model=list[Item])
-async def read_items(limit: int = Query(10), offset: int = Query(0)):
+async def read_items(request: Request, limit: int = Query(10), offset: int = Query(0)):
+    """List items; a weak ETag over the page lets clients revalidate without a body."""
     if not pool:
         raise HTTPException(status_code=503, detail="Database not configured")
-    try:
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute("SELECT id, name, description FROM items LIMIT %s OFFSET %s", (limit, offset))
-                results = await cur.fetchall()
-                return [Item(id=row[0], name=row[1], description=row[2]) for row in results]
-    except Exception as e:
-        logger.error(f"Error fetching items: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    async with acquire_connection(pool) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cur:
+            await cur.execute(SQL_LIST_ITEMS, (limit, offset))
+            body = json_dumps(await cur.fetchall())
+            return conditional_response(request, body, make_etag(body, weak=True), ITEMS_CACHE_CONTROL)
 
 if __name__ == "__main__":
     import uvicorn
     # Use environment variable for port, default to 8000
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One worker per core unless WEB_CONCURRENCY says otherwise; exported
+    # so the workers, which re-import main, split the pool by the same count
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1))
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        access_log=False,
+    )
@@ -6,6 +6,11 @@ import subprocess
 import time
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+# One keep-alive connection reused by every request in the script
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
 print("=" * 80)
 print("🚀 API TEST SUITE")
@@ -18,14 +23,22 @@ proc = subprocess.Popen(
     cwd="/Users/larrylo/SourceCode/python_mysql_http"
 )
 
-# Wait for server to start
-time.sleep(3)
+# Wait for server to start: poll / until it answers (up to ~5s)
+for _ in range(50):
+    try:
+        if session.get("http://localhost:8000/", timeout=0.1).ok:
+            break
+    except requests.exceptions.RequestException:
+        pass
+    time.sleep(0.1)
+else:
+    print("⚠️  Server did not answer within 5s; running tests anyway")
 
 try:
     # Test 1: Root endpoint
     print("\n✅ TEST 1: GET / (Root endpoint)")
     print("-" * 80)
-    response = requests.get("http://localhost:8000/")
+    response = session.get("http://localhost:8000/")
     print(f"Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
     assert response.status_code == 200
@@ -35,7 +48,7 @@ try:
     # Test 2: Homepage endpoint
     print("\n✅ TEST 2: GET /api/homepage")
     print("-" * 80)
-    response = requests.get("http://localhost:8000/api/homepage")
+    response = session.get("http://localhost:8000/api/homepage")
     print(f"Status: {response.status_code}")
     data = response.json()
     print(f"Keys: {list(data.keys())}")
@@ -47,7 +60,7 @@ try:
     print("\n✅ TEST 3: POST /api/users (Dynamic CRUD)")
     print("-" * 80)
     try:
-        response = requests.post(
+        response = session.post(
             "http://localhost:8000/api/users",
             json={"input": {"name": "John", "email": "john@example.com", "age": 30}}
         )
@@ -73,7 +86,7 @@ try:
 
         with open(csv_path, 'rb') as f:
             files = {'file': f}
-            response = requests.post("http://localhost:8000/api/batch/import", files=files)
+            response = session.post("http://localhost:8000/api/batch/import", files=files)
             print(f"Status: {response.status_code}")
             print(f"Response: {json.dumps(response.json(), indent=2)}")
             if response.status_code == 503:
@@ -100,6 +113,7 @@ try:
 finally:
     # Stop the server
     print("\n\n🛑 Stopping server...")
+    session.close()
     proc.terminate()
     proc.wait(timeout=5)
     print("✓ Server stopped")